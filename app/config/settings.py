@@ -2,11 +2,13 @@ from pathlib import Path
 
 SETTINGS_DIR = Path(__file__).resolve().parent
 BASE_DIR = SETTINGS_DIR.parent
+# SETTINGS_DIR is already resolved, so paths derived from it need no second resolve()
 IMAGES_PATH = BASE_DIR / 'data'
-IMAGES_PATH = IMAGES_PATH.resolve()
 
 class Settings:
     BASE_PATH: Path = BASE_DIR
     DOC: Path = IMAGES_PATH / 'Resolucion-R-OCS-SE-009-Nro.074-2025.pdf'
+    DOC_STR: str = str(DOC)
+    OCR_CACHE_DIR: Path = IMAGES_PATH / '.ocr_cache'
 
 settings = Settings()
\ No newline at end of file
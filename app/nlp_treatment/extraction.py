@@ -20,119 +20,181 @@
 # }
 # ------------------------------------------------------------
 
+import copy
+import hashlib
 import json
 import re
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
+from typing import Collection, Dict, Iterator, List, Optional, Tuple
 
-from preprocessing.normalization import get_clean_text
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib serializer
+    orjson = None
+
+from preprocessing.normalization import ARTICLE_HEADER, get_clean_text
+
+SectionIndex = Dict[str, List[Tuple[int, int]]]
+
+# Extraction results keyed by a BLAKE2b digest of the normalized text (small LRU)
+RESULT_CACHE_SIZE = 4
+_RESULT_CACHE: "OrderedDict[str, Dict]" = OrderedDict()
 
 # ------------ Regexes (section markers and patterns) ------------
 
 RX_RESOLUTION_LINE = re.compile(r'RESOLUCI[ÓO]N\s*:\s*(.+)', re.I)
-RX_CONSIDERANDO = re.compile(r'\bCONSIDERANDO\s*:?', re.I)
-RX_RESUELVE = re.compile(r'\bRESUELVE\s*:?', re.I)
-RX_DISPOSICIONES = re.compile(r'\bDISPOSICIONES\s+FINALES\b', re.I)
-
-# Recitals (each starts with "Que,")
-RX_RECITAL_ITEM = re.compile(r'(?:^|\n)(Que,\s.*?)(?=(?:\nQue,|\n?RESUELVE\b|$))', re.I | re.S)
-
-# Articles inside RESUELVE (capture body only)
-# Swallow ". - " or ".-" right after the header so bodies don't start with "- "
-RX_ARTICLE = re.compile(
-    r'(?:^|\n)\s*(?:Art[íi]?culo|Art\.)\s*'
-    r'(?:\d+|PRIMERO|SEGUNDO|TERCERO|CUARTO|QUINTO|SEXTO|S[EÉ]PTIMO|OCTAVO|NOVENO|D[EÉ]CIMO)'
-    r'\s*[.\-–—]+(?:\s*-\s*)?\s*(.*?)(?=(?:\n\s*(?:Art[íi]?culo|Art\.)\s*'
-    r'(?:\d+|PRIMERO|SEGUNDO|TERCERO|CUARTO|QUINTO|SEXTO|S[EÉ]PTIMO|OCTAVO|NOVENO|D[EÉ]CIMO)'
-    r'\s*[.\-–—]+)|$)',
-    re.I | re.S
-)
 
-# Final provisions (ordinal + text)
-ORDINAL = r'(PRIMERA|SEGUNDA|TERCERA|CUARTA|QUINTA|SEXTA|S[EÉ]PTIMA|OCTAVA|NOVENA|D[EÉ]CIMA)'
-RX_FINAL_ITEM = re.compile(
-    rf'(?:^|\n)\s*{ORDINAL}\s*[\.\-–—]*\s*(.*?)(?=(?:\n\s*{ORDINAL}\s*[\.\-–—]*|$))',
-    re.I | re.S
-)
+# Section and signature-role markers as (name, literal, pattern). They are located
+# on the uppercased text (see _index_sections): str.find jumps to each literal and
+# the flag-free pattern only confirms word boundaries / trailing colon there
+SECTION_MARKERS: List[Tuple[str, str, re.Pattern]] = [
+    ('considerando', 'CONSIDERANDO', re.compile(r'\bCONSIDERANDO\s*:?')),
+    ('resuelve', 'RESUELVE', re.compile(r'\bRESUELVE\s*:?')),
+    ('disposiciones', 'DISPOSICIONES', re.compile(r'\bDISPOSICIONES\s+FINALES\b')),
+    ('rector', 'RECTOR', re.compile(r'\bRECTOR\b')),
+    ('secretaria', 'SECRETARIA', re.compile(r'\bSECRETARIA\b')),
+    ('certifico', 'CERTIFICO', re.compile(r'\bCERTIFICO\b')),
+]
 
-# Final message starts at "Dado en ..."
-RX_FINAL_MESSAGE_START = re.compile(r'\bDado en\b', re.I)
+# Recitals (each starts with "Que,"); bodies run up to the next header
+RX_RECITAL_ITEM = re.compile(r'^Que,', re.I | re.M)
+
+# Article headers inside RESUELVE (same header as normalization; bodies are sliced
+# between headers). Swallow ". - " or ".-" right after the header so bodies don't start with "- "
+RX_ARTICLE = re.compile(rf'^\s*{ARTICLE_HEADER}(?:\s*-\s*)?\s*', re.I | re.M)
+
+# Final provisions (ordinal header; text is sliced up to the next header)
+ORDINAL = r'(PRIMERA|SEGUNDA|TERCERA|CUARTA|QUINTA|SEXTA|S[EÉ]PTIMA|OCTAVA|NOVENA|D[EÉ]CIMA)'
+RX_FINAL_ITEM = re.compile(rf'^\s*{ORDINAL}\s*[\.\-–—]*\s*', re.I | re.M)
 
 # Signature blocks / roles (capture and keep prefix in author)
+# Name words start with a letter that is not ASCII/Latin-1 lowercase and continue
+# with letters or dots; lowercase particles like "de la" may sit between them.
+# Name words are joined by spaces only, but the role word may sit on the next
+# line. Prefixes and role words stay case-insensitive
+NAME_WORD = r'[^\W\d_a-zß-öø-ÿ](?:[^\W\d_]|\.)+'
+NAME_PARTICLES = r'(?: +(?:de|del|la|las|los|y))*'
+NAME_NEXT_WORD = rf'{NAME_PARTICLES} +{NAME_WORD}'
+ROLE_SEP = r'(?: +|[ \t]*\n[ \t]*)'
 RX_RECTOR_SIG = re.compile(
-    r'(?:(Mgtr\.|Msc\.|Ing\.|Abg\.|Lcd\.)\s+)?'   # optional academic prefix
-    r'([A-ZÁÉÍÓÚÑ][\wÁÉÍÓÚÑ\.]+(?:\s+[A-ZÁÉÍÓÚÑ][\wÁÉÍÓÚÑ\.]+){1,4})\s+RECTOR\b',
-    re.I
+    r'(?:((?i:Mgtr|Msc|Ing|Abg|Lcd)\.) +)?'   # optional academic prefix
+    rf'({NAME_WORD}(?:{NAME_NEXT_WORD}){{1,4}}){ROLE_SEP}(?i:RECTOR)\b'
 )
 
 # Make courtesy prefix MANDATORY for SECRETARIA to avoid greedy captures
 RX_SECRETARIA_SIG = re.compile(
-    r'(Srta\.|Sra\.|Sr\.)\s+'                     # mandatory courtesy prefix
-    r'([A-ZÁÉÍÓÚÑ][\wÁÉÍÓÚÑ\.]+(?:\s+[A-ZÁÉÍÓÚÑ][\wÁÉÍÓÚÑ\.]+){1,5})\s+SECRETARIA\b',
-    re.I
+    r'((?i:Srta|Sra|Sr)\.) +'                     # mandatory courtesy prefix
+    rf'({NAME_WORD}(?:{NAME_NEXT_WORD}){{1,5}}){ROLE_SEP}(?i:SECRETARIA)\b'
 )
 
-# Final message block: from "Dado en ..." up to BEFORE any signature/certification marker
-RX_FINAL_MESSAGE_BLOCK = re.compile(
-    r'(Dado en.*?)(?=\s*(?:[A-ZÁÉÍÓÚÑ]\.?\s+)?(?:Mgtr\.|Msc\.|Ing\.|Abg\.|Lcd\.|Srta\.|Sra\.|Sr\.|RECTOR|SECRETARIA|En mi calidad)\b|$)',
-    re.I | re.S
+# Final message: from "Dado en ..." up to BEFORE the first signature/certification
+# marker (RX_FINAL_MSG_BOUNDARY); both ends are plain searches, no lazy body
+RX_FINAL_MESSAGE_START = re.compile(r'\bDado en\b', re.I)
+
+# Secretaria certification message (keep it concise): "En mi calidad ... Lo certifico."
+RX_CERTIFICO_START = re.compile(r'En mi calidad', re.I)
+RX_CERTIFICO_END = re.compile(r'Lo certifico\.', re.I)
+
+# Boundaries that indicate the start of signatures after final message: a full
+# signature (same patterns as the author captures, so a title only counts when it
+# opens one), a bare role word or the certification. Titles mentioned inside the
+# "Dado en" paragraph don't cut it
+RX_FINAL_MSG_BOUNDARY = re.compile(
+    rf'{RX_RECTOR_SIG.pattern}'
+    rf'|{RX_SECRETARIA_SIG.pattern}'
+    r'|\b(?i:RECTOR|SECRETARIA|CERTIFICO)\b'
+    r'|\b(?i:En mi calidad)\b'
 )
 
-# Secretaria certification message (keep it concise)
-RX_CERTIFICO_BLOCK = re.compile(r'(En mi calidad.*?Lo certifico\.)', re.I | re.S)
-
-# Boundaries that indicate the start of signatures after final message
-FINAL_MSG_BOUNDARIES = [
-    re.compile(r'\bMgtr\.\b', re.I),
-    re.compile(r'\bMsc\.\b', re.I),
-    re.compile(r'\bIng\.\b', re.I),
-    re.compile(r'\bAbg\.\b', re.I),
-    re.compile(r'\bLcd\.\b', re.I),
-    re.compile(r'\bSrta\.\b', re.I),
-    re.compile(r'\bSra\.\b', re.I),
-    re.compile(r'\bSr\.\b', re.I),
-    re.compile(r'\bRECTOR\b', re.I),
-    re.compile(r'\bSECRETARIA\b', re.I),
-    re.compile(r'\bCERTIFICO\b', re.I),
-]
+# Signature roles indexed from SECTION_MARKERS
+SIGNATURE_ROLES = ('rector', 'secretaria', 'certifico')
+
+# Whitespace left before ".", "," or ";"
+RX_SPACE_BEFORE_PUNCT = re.compile(r'\s+([.,;])')
 
 # -------------------------- Helpers ----------------------------
 
 def _cleanup_line(s: str) -> str:
     """Basic whitespace and stray punctuation cleanup."""
-    s = s.replace('  ', ' ')
-    s = re.sub(r'\s+\.', '.', s)
-    s = re.sub(r'\s+,', ',', s)
-    s = re.sub(r'\s+;', ';', s)
-    return s.strip()
-
-
-def _find_between(text: str, start_rx: re.Pattern, end_rx: re.Pattern) -> str:
-    """Return substring between start marker and next end marker; empty if not found."""
-    start = start_rx.search(text)
+    return RX_SPACE_BEFORE_PUNCT.sub(r'\1', s.replace('  ', ' ')).strip()
+
+
+def _index_sections(text: str) -> SectionIndex:
+    """Map every section marker to the spans where it occurs in text."""
+    upper = text.upper()
+    if len(upper) != len(text):
+        # Some characters (e.g. "ß") grow when uppercased; keep them as-is so spans map back to text
+        upper = ''.join(u if len(u) == 1 else c for c, u in zip(text, map(str.upper, text)))
+    index: SectionIndex = {}
+    for name, literal, rx in SECTION_MARKERS:
+        spans = index[name] = []
+        i = upper.find(literal)
+        while i != -1:
+            m = rx.match(upper, i)
+            if m:
+                spans.append(m.span())
+            i = upper.find(literal, m.end() if m else i + 1)
+    return index
+
+
+def _marker(index: SectionIndex, name: str, pos: int = 0) -> Optional[Tuple[int, int]]:
+    """Return the first span of marker `name` starting at or after pos; None if absent."""
+    return next((span for span in index[name] if span[0] >= pos), None)
+
+
+def _block_after(
+    text: str, index: SectionIndex, start: Optional[Tuple[int, int]], end: Optional[str] = None
+) -> str:
+    """Return substring from the end of span `start` up to the next `end` marker (or EOF)."""
     if not start:
         return ''
-    start_idx = start.end()
-    end = end_rx.search(text, start_idx)
-    end_idx = end.start() if end else len(text)
-    return text[start_idx:end_idx].strip()
+    end_span = _marker(index, end, start[1]) if end else None
+    return text[start[1]:end_span[0] if end_span else len(text)].strip()
+
 
+def _split_sections(text: str) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Scan the markers once and slice the text into the block each extractor works on.
+    Also return the signature roles that occur in the signatures block.
+    """
+    index = _index_sections(text)
+    res = RX_RESOLUTION_LINE.search(text)
+    disp = _marker(index, 'disposiciones')
+
+    blocks = {
+        "title": _block_after(text, index, res.span() if res else None, 'considerando'),
+        "recitals": _block_after(text, index, _marker(index, 'considerando'), 'resuelve'),
+        "resolutions": _block_after(text, index, _marker(index, 'resuelve'), 'disposiciones'),
+        "final_provisions": _block_after(text, index, disp),
+    }
+    # Signatures live after DISPOSICIONES FINALES; fall back to the whole text
+    blocks["signatures"] = blocks["final_provisions"] or text
+    tail_start = disp[1] if blocks["final_provisions"] else 0
+    roles = [name for name in SIGNATURE_ROLES if _marker(index, name, tail_start)]
 
-def _before(text: str, end_rx: re.Pattern) -> str:
-    """Return substring from start to the first occurrence of end_rx."""
-    end = end_rx.search(text)
-    return text[:end.start()].strip() if end else text.strip()
+    return blocks, roles
 
 
-def _after(text: str, start_rx: re.Pattern) -> str:
-    """Return substring from the end of start_rx to EOF."""
-    start = start_rx.search(text)
-    return text[start.end():].strip() if start else ''
+def _split_items(block: str, head_rx: re.Pattern) -> Iterator[Tuple[re.Match, str]]:
+    """
+    Yield (header match, body) pairs, each body running from the end of its
+    header up to the start of the next one (or EOF). Headers are located in a
+    single linear scan instead of a lazy body + lookahead per item.
+    """
+    prev = None
+    for head in head_rx.finditer(block):
+        if prev:
+            yield prev, block[prev.end():head.start()]
+        prev = head
+    if prev:
+        yield prev, block[prev.end():]
 
 
-def _earliest_index(s: str, patterns: List[re.Pattern]) -> Optional[int]:
-    """Return earliest index in s where any pattern matches; None if no matches."""
-    idxs = [m.start() for rx in patterns for m in [rx.search(s)] if m]
-    return min(idxs) if idxs else None
+def _earliest_index(s: str, pos: int = 0) -> Optional[int]:
+    """Return earliest index in s (from pos) where a signature boundary starts; None if no matches."""
+    m = RX_FINAL_MSG_BOUNDARY.search(s, pos)
+    return m.start() if m else None
 
 
 # -------------------------- Extractors -------------------------
@@ -147,10 +209,8 @@ def extract_n_resolution(text: str) -> str:
     return _cleanup_line(nres)
 
 
-def extract_title(text: str) -> str:
+def extract_title(title_block: str) -> str:
     # Title is the text after the "RESOLUCIÓN: ..." line until "CONSIDERANDO:"
-    after_res = _after(text, RX_RESOLUTION_LINE)
-    title_block = _before(after_res, RX_CONSIDERANDO)
     # Remove "CONSIDERANDO:" if stuck to the same line
     title_block = re.sub(r'\bCONSIDERANDO\s*:?\b', '', title_block, flags=re.I).strip()
     # Single line
@@ -158,51 +218,46 @@ def extract_title(text: str) -> str:
     return _cleanup_line(title_block)
 
 
-def extract_recitals(text: str) -> List[str]:
-    block = _find_between(text, RX_CONSIDERANDO, RX_RESUELVE)
-    if not block:
-        return []
-    items = []
-    for m in RX_RECITAL_ITEM.finditer('\n' + block):  # \n to unify anchors
-        item = m.group(1).strip()
-        items.append(_cleanup_line(item))
-    return items
-
-
-def extract_resolutions(text: str) -> List[str]:
-    block = _find_between(text, RX_RESUELVE, RX_DISPOSICIONES)
-    if not block:
-        return []
-    res = []
-    for m in RX_ARTICLE.finditer('\n' + block):
-        body = m.group(1).strip()
+def extract_recitals(block: str) -> Iterator[str]:
+    # Block is the text between "CONSIDERANDO:" and "RESUELVE:"
+    for head, body in _split_items(block, RX_RECITAL_ITEM):
+        # "Que," must be followed by whitespace to open a recital
+        if not body[:1].isspace():
+            continue
+        item = (head.group(0) + body).strip()
+        yield _cleanup_line(item)
+
+
+def extract_resolutions(block: str) -> Iterator[str]:
+    # Block is the text between "RESUELVE:" and "DISPOSICIONES FINALES"
+    for _, body in _split_items(block, RX_ARTICLE):
+        body = body.strip()
         # If a stray leading hyphen survived, remove it
         body = re.sub(r'^\s*-\s*', '', body)
-        body = _cleanup_line(body)
-        res.append(body)
-    return res
+        yield _cleanup_line(body)
 
 
-def extract_final_provisions_and_message(text: str) -> Tuple[List[str], str]:
-    disp_block = _after(text, RX_DISPOSICIONES)
+def extract_final_provisions_and_message(disp_block: str) -> Tuple[List[str], str]:
+    # Block is everything after "DISPOSICIONES FINALES"
     if not disp_block:
         return [], ''
 
     # --- Final message (clean block) ---
     final_msg = ''
-    m_block = RX_FINAL_MESSAGE_BLOCK.search(disp_block)
-    if m_block:
-        final_msg = _cleanup_line(m_block.group(1).strip())
+    m_start = RX_FINAL_MESSAGE_START.search(disp_block)
+    if m_start:
+        end = _earliest_index(disp_block, m_start.end())
+        final_msg = _cleanup_line(disp_block[m_start.start():end])
         # Cut EVERYTHING after the final message from the provisions area
-        disp_block_wo_msg = disp_block[:m_block.start()]
+        disp_block_wo_msg = disp_block[:m_start.start()]
     else:
         disp_block_wo_msg = disp_block
 
     # --- Final provisions from the remaining block ---
     provisions: List[str] = []
-    for m in RX_FINAL_ITEM.finditer('\n' + disp_block_wo_msg):
-        text_item = m.group(2).strip() if m.lastindex and m.lastindex >= 2 else m.group(0).strip()
-        ordinal = m.group(1).upper()
+    for head, body in _split_items(disp_block_wo_msg, RX_FINAL_ITEM):
+        text_item = body.strip()
+        ordinal = head.group(1).upper()
         full = f"{ordinal}. {text_item}"
         provisions.append(_cleanup_line(full))
 
@@ -217,33 +272,36 @@ def extract_final_provisions_and_message(text: str) -> Tuple[List[str], str]:
 
     return provisions, final_msg
 
-def extract_signatures(text: str) -> List[Dict[str, str]]:
-    tail = _after(text, RX_DISPOSICIONES) or text
+def extract_signatures(tail: str, roles: Collection[str] = SIGNATURE_ROLES) -> List[Dict[str, str]]:
+    # Each signature pattern needs its role word; `roles` lists the ones present in tail
+    rector_author = secretaria_author = secretaria_msg = ''
+    if not roles:
+        # No signature markers (e.g. truncated OCR): skip every scan over the tail
+        return [{"author": "", "role": "", "message": ""}, {"author": "", "role": "", "message": ""}]
 
-    rector_author = ''
-    m_rector = RX_RECTOR_SIG.search(tail)
+    m_rector = RX_RECTOR_SIG.search(tail) if 'rector' in roles else None
     if m_rector:
         prefix = (m_rector.group(1) or '').strip()
         name = _cleanup_line(m_rector.group(2).strip())
         rector_author = (prefix + ' ' + name).strip()
 
-    m_secr = RX_SECRETARIA_SIG.search(tail)
+    m_secr = RX_SECRETARIA_SIG.search(tail) if 'secretaria' in roles else None
     if m_secr:
         prefix = (m_secr.group(1) or '').strip()
         name = _cleanup_line(m_secr.group(2).strip())
         secretaria_author = (prefix + ' ' + name).strip()
 
-    secretaria_msg = ''
-    m_cert = RX_CERTIFICO_BLOCK.search(tail)
-    if m_cert:
-        secretaria_msg = _cleanup_line(m_cert.group(1).strip())
+    m_cert = RX_CERTIFICO_START.search(tail) if 'certifico' in roles else None
+    m_cert_end = RX_CERTIFICO_END.search(tail, m_cert.end()) if m_cert else None
+    if m_cert_end:
+        secretaria_msg = _cleanup_line(tail[m_cert.start():m_cert_end.end()])
 
     signatures: List[Dict[str, str]] = []
     if rector_author:
         signatures.append({"author": rector_author, "role": "RECTOR", "message": ""})
     if secretaria_author or secretaria_msg:
         signatures.append({
-            "author": secretaria_author or "",
+            "author": secretaria_author,
             "role": "SECRETARIA",
             "message": secretaria_msg
         })
@@ -260,29 +318,45 @@ def extract_signatures(text: str) -> List[Dict[str, str]]:
 def extract_to_dict() -> Dict:
     """
     Run extraction on the normalized text and return a dict matching your JSON schema.
+    Results are cached per text, so repeated calls skip the regex passes; callers
+    get their own copy, so mutating it never touches the cache.
     """
     text = get_clean_text()
+    key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    if key in _RESULT_CACHE:
+        _RESULT_CACHE.move_to_end(key)
+        return copy.deepcopy(_RESULT_CACHE[key])
+    # Locate every section marker once and hand each extractor its own block
+    blocks, roles = _split_sections(text)
 
     data = {
         "n_resolution": extract_n_resolution(text),
-        "title": extract_title(text),
-        "recitals": extract_recitals(text),
-        "resolutions": extract_resolutions(text),
+        "title": extract_title(blocks["title"]),
+        # Materialize the item generators here, at the JSON boundary
+        "recitals": list(extract_recitals(blocks["recitals"])),
+        "resolutions": list(extract_resolutions(blocks["resolutions"])),
         "final_provisions": [],
         "final_message": "",
         "signatures": []
     }
 
-    provisions, final_msg = extract_final_provisions_and_message(text)
+    provisions, final_msg = extract_final_provisions_and_message(blocks["final_provisions"])
     data["final_provisions"] = provisions
     data["final_message"] = final_msg
-    data["signatures"] = extract_signatures(text)
+    data["signatures"] = extract_signatures(blocks["signatures"], roles)
 
-    return data
+    _RESULT_CACHE[key] = data
+    if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+        _RESULT_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
 
 
 def save_extraction_json(path: str) -> None:
     """Dump the extracted dict to a JSON file."""
     data = extract_to_dict()
+    if orjson is not None:
+        # Single binary write; orjson emits UTF-8 without escaping non-ASCII
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
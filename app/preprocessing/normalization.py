@@ -1,7 +1,9 @@
+import functools
 import re
 import unicodedata
 from typing import List
 
+from config.settings import settings
 from preprocessing.ocr import get_plain_text
 
 # Headers and Footer
@@ -33,21 +35,15 @@ RE_SECTION_HEADERS = [
     re.compile(r'^\s*DISPOSICIONES\s+FINALES\s*$', re.I),
 ]
 
+# Article header: "Artículo N.-" / "Art. N.-" (ordinal spelled once, shared below)
+ARTICLE_ORDINAL = r'(?:\d+|PRIMERO|SEGUNDO|TERCERO|CUARTO|QUINTO|SEXTO|S[EÉ]PTIMO|OCTAVO|NOVENO|D[EÉ]CIMO)'
+ARTICLE_HEADER = rf'(?:Art[íi]?culo|Art\.)\s*{ARTICLE_ORDINAL}\s*[\.\-–—]+'
+
 # To keep artícles
-RE_ARTICLES = re.compile(
-    r'^\s*(?:Art[íi]?culo|Art\.)\s*'
-    r'(?:\d+|PRIMERO|SEGUNDO|TERCERO|CUARTO|QUINTO|SEXTO|S[EÉ]PTIMO|OCTAVO|NOVENO|D[EÉ]CIMO)'
-    r'\s*[\.\-–—]+',
-    re.I
-)
+RE_ARTICLES = re.compile(rf'^\s*{ARTICLE_HEADER}', re.I)
 
 # Inline article header
-ARTICLE_HEADER_INLINE_RX = re.compile(
-    r'\s+(?=(?:Art[íi]?culo|Art\.)\s*'
-    r'(?:\d+|PRIMERO|SEGUNDO|TERCERO|CUARTO|QUINTO|SEXTO|S[EÉ]PTIMO|OCTAVO|NOVENO|D[EÉ]CIMO)'
-    r'\s*[\.\-–—]+)',
-    re.I
-)
+ARTICLE_HEADER_INLINE_RX = re.compile(rf'\s+(?={ARTICLE_HEADER})', re.I)
 
 # Final provisions
 RE_FINAL_PROVISIONS = re.compile(
@@ -56,12 +52,7 @@ RE_FINAL_PROVISIONS = re.compile(
 )
 
 # Ensure space after "Artículo N.-" / "Art. N.-"
-SPACE_AFTER_DOT_DASH_RX = re.compile(
-    r'((?:Art[íi]?culo|Art\.)\s*'
-    r'(?:\d+|PRIMERO|SEGUNDO|TERCERO|CUARTO|QUINTO|SEXTO|S[EÉ]PTIMO|OCTAVO|NOVENO|D[EÉ]CIMO)'
-    r'\s*[\.\-–—]+)(\S)',
-    re.I
-)
+SPACE_AFTER_DOT_DASH_RX = re.compile(rf'({ARTICLE_HEADER})(\S)', re.I)
 
 # To fix docTR gramatical errors
 OCR_COMMON_FIXES: List[tuple[re.Pattern, str]] = [
@@ -246,7 +237,15 @@ def get_clean_text() -> str:
     """
         Run the full normalization pipeline on OCR output and return a clean text
         with clear sections and real article headers preserved for the extraction layer.
+        The result is memoized until the source document changes (mtime or size).
     """
+    stat = settings.DOC.stat()
+    return _get_clean_text_cached(settings.DOC_STR, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_clean_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    # Arguments only form the cache key; OCR reads the document from settings
     raw = get_plain_text()
 
     # 1) Unicode + punctuation normalization
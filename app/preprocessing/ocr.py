@@ -1,17 +1,48 @@
+import functools
+import hashlib
+import os
+import tempfile
+
 from doctr.io import DocumentFile
 from doctr.models import ocr_predictor
 from config.settings import settings
 
 
+@functools.lru_cache(maxsize=1)
+def _get_predictor():
+    # Load the pretrained weights once per process
+    return ocr_predictor(pretrained=True)
+
+
 def get_plain_text() -> str:
+    # Read the PDF once: the bytes key the cache and feed doctr directly
+    pdf_bytes = settings.DOC.read_bytes()
+
+    # Rendered OCR output is cached on disk, keyed by the PDF contents
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    cache_file = settings.OCR_CACHE_DIR / f'{digest}.txt'
+    if cache_file.exists():
+        return cache_file.read_text(encoding='utf-8')
+
+    doc = DocumentFile.from_pdf(pdf_bytes)
     
-    doc = DocumentFile.from_pdf(settings.DOC)
-    
-    predictor = ocr_predictor(pretrained=True)
+    predictor = _get_predictor()
     
     result = predictor(doc)
 
     string_result = result.render()
+
+    # Write to a temp file and rename it into place, so an interrupted run never
+    # leaves a truncated cache entry behind
+    settings.OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=settings.OCR_CACHE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(string_result)
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     
     return string_result
 